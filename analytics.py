@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Dashboard query, filter and per-tab aggregations.
+
+Kept free of Streamlit so the same code is what app.py renders and what
+benchmark.py times.
+"""
+
+SALES_QUERY = """
+    SELECT v.game_name AS Name, p.name AS Platform, g.name AS Genre,
+           pub.name AS Publisher, v.Year, v.NA_Sales, v.EU_Sales,
+           v.JP_Sales, v.Other_Sales, v.Global_Sales
+    FROM vgsales v
+    JOIN platform p ON v.platform_id = p.id
+    JOIN genre g ON v.genre_id = g.id
+    JOIN publisher pub ON v.publisher_id = pub.id
+"""
+
+REGIONS = ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
+REGION_NAMES = ["North America", "Europe", "Japan", "Other Regions"]
+NUMERIC_COLS = ["Year"] + REGIONS + ["Global_Sales"]
+
+
+def filter_sales(df, platforms=None, genres=None):
+    df_filtered = df.copy()
+    if platforms:
+        df_filtered = df_filtered[df_filtered["Platform"].isin(platforms)]
+    if genres:
+        df_filtered = df_filtered[df_filtered["Genre"].isin(genres)]
+    return df_filtered
+
+
+def sales_over_time(df):
+    """Trends tab: global sales per year (after 1980)."""
+    return df[df["Year"] > 1980].groupby("Year")["Global_Sales"].sum().reset_index()
+
+
+def top_sales(df, by, n=10):
+    """Rankings tab: top ``n`` publishers/genres by global sales."""
+    return df.groupby(by)["Global_Sales"].sum().nlargest(n).reset_index()
+
+
+def top_games(df, n=10):
+    return df.nlargest(n, "Global_Sales")[["Name", "Global_Sales"]]
+
+
+def regional_totals(df):
+    """Regions tab: total sales per region, in REGIONS order."""
+    return [df[col].sum() for col in REGIONS]
+
+
+def platform_genre_heatmap(df, n_platforms=12, n_genres=10):
+    pivot = df.pivot_table(values="Global_Sales", index="Genre", columns="Platform", aggfunc="sum", fill_value=0)
+    # Select top 12 platforms and top 10 genres to keep heatmap readable
+    top_platforms = pivot.sum(axis=0).nlargest(n_platforms).index
+    top_genres = pivot.sum(axis=1).nlargest(n_genres).index
+    return pivot.loc[top_genres, top_platforms]
+
+
+def correlation_matrix(df):
+    return df[NUMERIC_COLS].corr()
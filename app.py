@@ -1,19 +1,44 @@
 # -*- coding: utf-8 -*-
+import time
+_T0 = time.perf_counter()
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import os
-from sqlalchemy import create_engine
 from dotenv import load_dotenv
-import joblib
-from preprocessor import FullPreprocessor
+import analytics
+import db
+import explanations
+import instrumentation
+import search
+from instrumentation import span
 
 load_dotenv()
 
+# "parallel" (default): plotly is imported after the KPIs are drawn, and data
+# and model load concurrently with the model awaited only by the ML tab.
+# "sequential": the old eager behaviour, kept for time-to-first-paint comparison.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "parallel")
+if STARTUP_MODE == "sequential":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+_timings = {}
+
+def mark(name):
+    """Record seconds since the start of this script run (see startup_report.py)."""
+    _timings[name] = time.perf_counter() - _T0
+
 st.set_page_config(page_title="Game Sales Dashboard", layout="wide")
 
+# DEBUG_PANEL=1 adds a sidebar panel with this rerun's spans and a profiler hook
+DEBUG_PANEL = os.getenv("DEBUG_PANEL", "").lower() in ("1", "true", "yes", "on")
+instrumentation.begin_run()
+instrumentation.serve_metrics()
+
 st.markdown("""
 <style>
     .main-title {
@@ -40,207 +65,350 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def _read_sales():
+    with span("dashboard.db_query"):
+        return db.read_sql(analytics.SALES_QUERY)
+
+def _load_model_artifacts():
+    # joblib unpickling pulls in xgboost, sklearn and category_encoders
+    import joblib
+    try:
+        model = joblib.load("models/model_xgb.pkl")
+        preprocessor = joblib.load("models/preprocessor.pkl")
+        return model, preprocessor
+    except Exception:
+        return None, None
+
+@st.cache_resource
+def _warmup():
+    """Start data and model loading on a thread pool, once per process."""
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup")
+    futures = {
+        # Spans come back with the data so the rerun that waits on it can show them
+        "data": executor.submit(instrumentation.collect, _read_sales),
+        "model": executor.submit(_load_model_artifacts),
+    }
+    executor.shutdown(wait=False)
+    return futures
+
 @st.cache_data
 def load_data():
-    DB_USER = os.getenv("DB_USER", "root")
-    DB_PASSWORD = os.getenv("DB_PASSWORD")
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_NAME = os.getenv("DB_NAME", "game_sales")
-    
-    # Check if password exists to avoid connection errors
-    if not DB_PASSWORD:
-        st.error("Error: DB_PASSWORD not found in .env file")
-        return pd.DataFrame()
-
     try:
-        engine = create_engine(f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}")
-        query = """
-            SELECT v.game_name AS Name, p.name AS Platform, g.name AS Genre,
-                   pub.name AS Publisher, v.Year, v.NA_Sales, v.EU_Sales, 
-                   v.JP_Sales, v.Other_Sales, v.Global_Sales
-            FROM vgsales v
-            JOIN platform p ON v.platform_id = p.id
-            JOIN genre g ON v.genre_id = g.id
-            JOIN publisher pub ON v.publisher_id = pub.id
-        """
-        return pd.read_sql(query, engine)
+        if STARTUP_MODE == "sequential":
+            return _read_sales()
+        # Take the future out of the process-wide dict so st.cache_data holds the only copy
+        future = _warmup().pop("data", None)
+        if future is None:
+            # Already consumed, e.g. after the data cache was cleared
+            return _read_sales()
+        df, spans = future.result()
+        instrumentation.adopt(spans)
+        return df
+    except ValueError as e:
+        # Missing DB_PASSWORD / DATABASE_URL
+        st.error(f"Error: {e}")
+        return pd.DataFrame()
     except Exception as e:
         st.error(f"Database Connection Error: {e}")
         return pd.DataFrame()
 
 @st.cache_resource
 def load_ml_model():
-    try:
-        model = joblib.load("models/model_xgb.pkl")
-        preprocessor = joblib.load("models/preprocessor.pkl")
-        return model, preprocessor
-    except:
+    if STARTUP_MODE == "sequential":
+        return _load_model_artifacts()
+    return _warmup()["model"].result()
+
+@st.cache_resource
+def load_explainer():
+    """TreeExplainer and stored global importance for the loaded model version."""
+    model, _ = load_ml_model()
+    if model is None:
         return None, None
+    version = explanations.model_version()
+    return explanations.get_explainer(model, version), explanations.load_global_importance(version)
+
+@st.cache_resource
+def load_title_index():
+    """Title search index over the loaded data, built once per process."""
+    with span("search.build_index"):
+        return search.TitleIndex(load_data())
+
+# Started just before the try so the finally below always stops it
+_profiler = None
+if DEBUG_PANEL and st.session_state.get("_profile_next"):
+    _profiler = instrumentation.start_profiler(st.session_state.pop("_profile_next"))
+try:
+    if STARTUP_MODE == "sequential":
+        df = load_data()
+        model, preprocessor = load_ml_model()
+        mark("model_ready")
+    else:
+        _warmup()
+        df = load_data()
+    mark("data_ready")
 
-df = load_data()
-model, preprocessor = load_ml_model()
-
-st.sidebar.title("Dashboard Controls")
-
-# Sidebar Filters
-if not df.empty:
-    selected_platform = st.sidebar.multiselect("Filter by Platform", sorted(df["Platform"].unique()))
-    selected_genre = st.sidebar.multiselect("Filter by Genre", sorted(df["Genre"].unique()))
-
-    df_filtered = df.copy()
-    if selected_platform:
-        df_filtered = df_filtered[df_filtered["Platform"].isin(selected_platform)]
-    if selected_genre:
-        df_filtered = df_filtered[df_filtered["Genre"].isin(selected_genre)]
-else:
-    df_filtered = pd.DataFrame()
-    st.warning("No data available. Please check your database connection.")
-
-st.sidebar.info("Tip: Click on graphs to view fullscreen")
-
-st.markdown('<h1 class="main-title">Game Sales Analytics Dashboard</h1>', unsafe_allow_html=True)
-
-# KPI Cards
-if not df_filtered.empty:
-    col1, col2, col3, col4 = st.columns(4)
-    col1.markdown(f"<div class='glass-card'>Total Games<br><b>{len(df_filtered):,}</b></div>", unsafe_allow_html=True)
-    col2.markdown(f"<div class='glass-card'>Total Sales<br><b>{df_filtered['Global_Sales'].sum():.2f}M</b></div>", unsafe_allow_html=True)
-    col3.markdown(f"<div class='glass-card'>Platforms<br><b>{df_filtered['Platform'].nunique()}</b></div>", unsafe_allow_html=True)
-    col4.markdown(f"<div class='glass-card'>Genres<br><b>{df_filtered['Genre'].nunique()}</b></div>", unsafe_allow_html=True)
-
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Trends", "Rankings", "Regions", "Heatmap", "Correlations", "ML Prediction"])
-
-    with tab1:
-        st.subheader("Global Sales Over Time")
-        ts = df_filtered[df_filtered['Year'] > 1980].groupby("Year")['Global_Sales'].sum().reset_index()
-        fig = px.line(ts, x='Year', y='Global_Sales', template="plotly_dark", markers=True)
-        fig.update_traces(line_color='#00f5d4', line_width=3)
-        fig.update_layout(height=450, margin=dict(l=50, r=50, t=50, b=50))
-        st.plotly_chart(fig, width="stretch")
-
-    with tab2:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown("### Top Publishers")
-            top_pub = df_filtered.groupby("Publisher")["Global_Sales"].sum().nlargest(10).reset_index()
-            fig = px.bar(top_pub, x="Global_Sales", y="Publisher", orientation='h', template='plotly_dark')
-            st.plotly_chart(fig, width="stretch")
-        with col2:
-            st.markdown("### Top Genres")
-            top_genre = df_filtered.groupby("Genre")["Global_Sales"].sum().nlargest(10).reset_index()
-            fig = px.bar(top_genre, x="Global_Sales", y="Genre", orientation='h', template='plotly_dark')
-            st.plotly_chart(fig, width="stretch")
-        with col3:
-            st.markdown("### Top Games")
-            top_games = df_filtered.nlargest(10, 'Global_Sales')[['Name', 'Global_Sales']]
-            fig = px.bar(top_games, x="Global_Sales", y="Name", orientation='h', template='plotly_dark')
-            st.plotly_chart(fig, width="stretch")
-
-    with tab3:
-        st.subheader("Regional Sales Distribution")
-        regions = ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
-        vals = [df_filtered[col].sum() for col in regions]
-        region_names = ["North America", "Europe", "Japan", "Other Regions"]
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            fig = go.Figure(go.Bar(x=region_names, y=vals, text=[f"{v:.2f}M" for v in vals], textposition='outside',
-                                   marker_color=['#7DA6FF', '#FF8C75', '#46D18A', '#B37DFF']))
-            fig.update_layout(template="plotly_dark", height=450, yaxis_title="Sales (Million Units)")
-            st.plotly_chart(fig, width="stretch")
-        with col2:
-            fig = px.pie(values=vals, names=region_names, hole=0.4, template="plotly_dark")
-            fig.update_layout(height=450)
-            st.plotly_chart(fig, width="stretch")
-
-    with tab4:
-        st.subheader("Platform x Genre Heatmap")
-        pivot = df_filtered.pivot_table(values="Global_Sales", index="Genre", columns="Platform", aggfunc="sum", fill_value=0)
-        # Select top 12 platforms and top 10 genres to keep heatmap readable
-        top_platforms = pivot.sum(axis=0).nlargest(12).index
-        top_genres = pivot.sum(axis=1).nlargest(10).index
-        pivot = pivot.loc[top_genres, top_platforms]
-        
-        fig = px.imshow(pivot, text_auto='.1f', template='plotly_dark', aspect='auto')
-        fig.update_layout(height=700)
-        st.plotly_chart(fig, width="stretch")
-
-    with tab5:
-        st.subheader("Feature Correlation Analysis")
-        numeric_cols = ['Year', 'NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales']
-        corr_matrix = df_filtered[numeric_cols].corr()
-        fig = px.imshow(corr_matrix, text_auto='.3f', aspect='auto', color_continuous_scale='RdBu_r', 
-                        template='plotly_dark', zmin=-1, zmax=1)
-        fig.update_layout(height=600)
-        st.plotly_chart(fig, width="stretch")
-
-    with tab6:
-        st.subheader("ML Prediction")
-        if model is None:
-            st.error("ML Model not found. Please run `train_model.py` first to generate models.")
-        else:
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                pred_platform = st.selectbox("Platform", sorted(df["Platform"].unique()))
-                pred_genre = st.selectbox("Genre", sorted(df["Genre"].unique()))
-            with col2:
-                pred_publisher = st.selectbox("Publisher", sorted(df["Publisher"].unique()))
-                pred_year = st.number_input("Year", 1980, 2030, 2024)
-            with col3:
-                pred_na = st.number_input("NA Sales (M)", 0.0, 100.0, 1.0, 0.1)
-                pred_eu = st.number_input("EU Sales (M)", 0.0, 100.0, 0.5, 0.1)
-            pred_jp = st.number_input("JP Sales (M)", 0.0, 100.0, 0.3, 0.1)
-            pred_other = st.number_input("Other Sales (M)", 0.0, 100.0, 0.2, 0.1)
+    st.sidebar.title("Dashboard Controls")
+
+    # Sidebar Filters
+    if not df.empty:
+        selected_platform = st.sidebar.multiselect("Filter by Platform", sorted(df["Platform"].unique()))
+        selected_genre = st.sidebar.multiselect("Filter by Genre", sorted(df["Genre"].unique()))
+
+        with span("dashboard.filter"):
+            df_filtered = analytics.filter_sales(df, selected_platform, selected_genre)
+    else:
+        df_filtered = pd.DataFrame()
+        st.warning("No data available. Please check your database connection.")
+
+    st.sidebar.info("Tip: Click on graphs to view fullscreen")
+
+    st.markdown('<h1 class="main-title">Game Sales Analytics Dashboard</h1>', unsafe_allow_html=True)
+
+    # KPI Cards
+    if not df_filtered.empty:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.markdown(f"<div class='glass-card'>Total Games<br><b>{len(df_filtered):,}</b></div>", unsafe_allow_html=True)
+        col2.markdown(f"<div class='glass-card'>Total Sales<br><b>{df_filtered['Global_Sales'].sum():.2f}M</b></div>", unsafe_allow_html=True)
+        col3.markdown(f"<div class='glass-card'>Platforms<br><b>{df_filtered['Platform'].nunique()}</b></div>", unsafe_allow_html=True)
+        col4.markdown(f"<div class='glass-card'>Genres<br><b>{df_filtered['Genre'].nunique()}</b></div>", unsafe_allow_html=True)
+        mark("first_paint")
+
+        import plotly.express as px
+        import plotly.graph_objects as go
+
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["Trends", "Rankings", "Regions", "Heatmap", "Correlations", "ML Prediction", "Title Search"])
+
+        with tab1:
+            st.subheader("Global Sales Over Time")
+            with span("dashboard.trends.aggregate"):
+                ts = analytics.sales_over_time(df_filtered)
+            with span("dashboard.trends.figure"):
+                fig = px.line(ts, x='Year', y='Global_Sales', template="plotly_dark", markers=True)
+                fig.update_traces(line_color='#00f5d4', line_width=3)
+                fig.update_layout(height=450, margin=dict(l=50, r=50, t=50, b=50))
+                st.plotly_chart(fig, width="stretch")
+
+        with tab2:
+            with span("dashboard.rankings.aggregate"):
+                top_pub = analytics.top_sales(df_filtered, "Publisher")
+                top_genre = analytics.top_sales(df_filtered, "Genre")
+                top_games = analytics.top_games(df_filtered)
+            with span("dashboard.rankings.figure"):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.markdown("### Top Publishers")
+                    fig = px.bar(top_pub, x="Global_Sales", y="Publisher", orientation='h', template='plotly_dark')
+                    st.plotly_chart(fig, width="stretch")
+                with col2:
+                    st.markdown("### Top Genres")
+                    fig = px.bar(top_genre, x="Global_Sales", y="Genre", orientation='h', template='plotly_dark')
+                    st.plotly_chart(fig, width="stretch")
+                with col3:
+                    st.markdown("### Top Games")
+                    fig = px.bar(top_games, x="Global_Sales", y="Name", orientation='h', template='plotly_dark')
+                    st.plotly_chart(fig, width="stretch")
+
+        with tab3:
+            st.subheader("Regional Sales Distribution")
+            with span("dashboard.regions.aggregate"):
+                vals = analytics.regional_totals(df_filtered)
+            region_names = analytics.REGION_NAMES
+            with span("dashboard.regions.figure"):
+                col1, col2 = st.columns([2, 1])
+                with col1:
+                    fig = go.Figure(go.Bar(x=region_names, y=vals, text=[f"{v:.2f}M" for v in vals], textposition='outside',
+                                           marker_color=['#7DA6FF', '#FF8C75', '#46D18A', '#B37DFF']))
+                    fig.update_layout(template="plotly_dark", height=450, yaxis_title="Sales (Million Units)")
+                    st.plotly_chart(fig, width="stretch")
+                with col2:
+                    fig = px.pie(values=vals, names=region_names, hole=0.4, template="plotly_dark")
+                    fig.update_layout(height=450)
+                    st.plotly_chart(fig, width="stretch")
+
+        with tab4:
+            st.subheader("Platform x Genre Heatmap")
+            with span("dashboard.heatmap.aggregate"):
+                pivot = analytics.platform_genre_heatmap(df_filtered)
+
+            with span("dashboard.heatmap.figure"):
+                fig = px.imshow(pivot, text_auto='.1f', template='plotly_dark', aspect='auto')
+                fig.update_layout(height=700)
+                st.plotly_chart(fig, width="stretch")
+
+        with tab5:
+            st.subheader("Feature Correlation Analysis")
+            with span("dashboard.correlations.aggregate"):
+                corr_matrix = analytics.correlation_matrix(df_filtered)
+            with span("dashboard.correlations.figure"):
+                fig = px.imshow(corr_matrix, text_auto='.3f', aspect='auto', color_continuous_scale='RdBu_r', 
+                                template='plotly_dark', zmin=-1, zmax=1)
+                fig.update_layout(height=600)
+                st.plotly_chart(fig, width="stretch")
+
+        with tab6:
+            st.subheader("ML Prediction")
+            if STARTUP_MODE != "sequential":
+                # Every other tab is already on screen; only this one waits for the model
+                with st.spinner("Loading ML model..."):
+                    model, preprocessor = load_ml_model()
+                mark("model_ready")
+            if model is None:
+                st.error("ML Model not found. Please run `train_model.py` first to generate models.")
+            else:
+                # Explanations are optional: without shap the prediction still works
+                try:
+                    with st.spinner("Loading explainer..."):
+                        explainer, global_importance = load_explainer()
+                except Exception as e:
+                    explainer, global_importance = None, None
+                    st.warning(f"Prediction explanations unavailable: {e}")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    pred_platform = st.selectbox("Platform", sorted(df["Platform"].unique()))
+                    pred_genre = st.selectbox("Genre", sorted(df["Genre"].unique()))
+                with col2:
+                    pred_publisher = st.selectbox("Publisher", sorted(df["Publisher"].unique()))
+                    pred_year = st.number_input("Year", 1980, 2030, 2024)
+                with col3:
+                    pred_na = st.number_input("NA Sales (M)", 0.0, 100.0, 1.0, 0.1)
+                    pred_eu = st.number_input("EU Sales (M)", 0.0, 100.0, 0.5, 0.1)
+                pred_jp = st.number_input("JP Sales (M)", 0.0, 100.0, 0.3, 0.1)
+                pred_other = st.number_input("Other Sales (M)", 0.0, 100.0, 0.2, 0.1)
             
-            if st.button("Predict", type="primary"):
-                # 1. Total Known Sales
-                total_known_sales = pred_na + pred_eu + pred_jp + pred_other
+                if st.button("Predict", type="primary"):
+                    # 1. Total Known Sales
+                    total_known_sales = pred_na + pred_eu + pred_jp + pred_other
                 
-                # 2. Publisher Avg (Get historical average from loaded dataframe)
-                publisher_stats = df[df['Publisher'] == pred_publisher]['Global_Sales']
-                if not publisher_stats.empty:
-                    publisher_avg = publisher_stats.mean()
-                else:
-                    publisher_avg = 0.0 # Default if new publisher
+                    # 2. Publisher Avg (Get historical average from loaded dataframe)
+                    publisher_stats = df[df['Publisher'] == pred_publisher]['Global_Sales']
+                    if not publisher_stats.empty:
+                        publisher_avg = publisher_stats.mean()
+                    else:
+                        publisher_avg = 0.0 # Default if new publisher
                 
-                # 3. Platform Count (Get historical count from loaded dataframe)
-                platform_stats = df[df['Platform'] == pred_platform]
-                platform_count = platform_stats.shape[0] if not platform_stats.empty else 0
-
-                # Create DataFrame with ALL features expected by the model
-                input_data = pd.DataFrame([{
-                    'Name': 'Prediction', 
-                    'Platform': pred_platform, 
-                    'Genre': pred_genre,
-                    'Publisher': pred_publisher, 
-                    'Year': pred_year, 
-                    'NA_Sales': pred_na,
-                    'EU_Sales': pred_eu, 
-                    'JP_Sales': pred_jp, 
-                    'Other_Sales': pred_other,
-                    # Added features
-                    'Total_Known_Sales': total_known_sales,
-                    'Publisher_Avg': publisher_avg,
-                    'Platform_Count': platform_count
-                }])
+                    # 3. Platform Count (Get historical count from loaded dataframe)
+                    platform_stats = df[df['Platform'] == pred_platform]
+                    platform_count = platform_stats.shape[0] if not platform_stats.empty else 0
 
-                try:
-                    processed = preprocessor.transform(input_data)
-                    # Convert to standard Python float to avoid float32 errors in Streamlit
-                    prediction = float(model.predict(processed)[0])
+                    # Create DataFrame with ALL features expected by the model
+                    input_data = pd.DataFrame([{
+                        'Name': 'Prediction', 
+                        'Platform': pred_platform, 
+                        'Genre': pred_genre,
+                        'Publisher': pred_publisher, 
+                        'Year': pred_year, 
+                        'NA_Sales': pred_na,
+                        'EU_Sales': pred_eu, 
+                        'JP_Sales': pred_jp, 
+                        'Other_Sales': pred_other,
+                        # Added features
+                        'Total_Known_Sales': total_known_sales,
+                        'Publisher_Avg': publisher_avg,
+                        'Platform_Count': platform_count
+                    }])
+
+                    prediction = None
+                    try:
+                        with span("predict.preprocess"):
+                            processed = preprocessor.transform(input_data)
+                        # Convert to standard Python float to avoid float32 errors in Streamlit
+                        with span("predict.model"):
+                            prediction = float(model.predict(processed)[0])
                     
-                    st.success(f"Predicted Global Sales: **{prediction:.2f}M Units**")
+                        st.success(f"Predicted Global Sales: **{prediction:.2f}M Units**")
                     
-                    col_a, col_b = st.columns(2)
-                    col_a.metric("Input Total (Regions)", f"{total_known_sales:.2f}M")
-                    col_b.metric("AI Prediction (Global)", f"{prediction:.2f}M")
+                        col_a, col_b = st.columns(2)
+                        col_a.metric("Input Total (Regions)", f"{total_known_sales:.2f}M")
+                        col_b.metric("AI Prediction (Global)", f"{prediction:.2f}M")
                     
-                    # Convert to standard Python float for the progress bar
-                    progress_val = min(prediction / 20.0, 1.0)
-                    st.progress(float(progress_val))
+                        # Convert to standard Python float for the progress bar
+                        progress_val = min(prediction / 20.0, 1.0)
+                        st.progress(float(progress_val))
                     
-                except Exception as e:
-                    st.error(f"Error during prediction: {e}")
-                    st.error("Please ensure the input data format matches the training data.")
+                    except Exception as e:
+                        st.error(f"Error during prediction: {e}")
+                        st.error("Please ensure the input data format matches the training data.")
+
+                    if prediction is not None and explainer is not None:
+                        try:
+                            with span("predict.explain"):
+                                contrib = explanations.explain(explainer, preprocessor, processed).iloc[0]
+                            contrib = contrib.reindex(contrib.abs().sort_values().index)
+                            st.markdown("### Why this prediction?")
+                            fig = px.bar(x=contrib.values, y=contrib.index, orientation='h', template='plotly_dark',
+                                         color=contrib.values > 0, color_discrete_map={True: '#46D18A', False: '#FF8C75'},
+                                         labels={"x": "Contribution (M units)", "y": ""})
+                            fig.update_layout(height=400, showlegend=False)
+                            st.plotly_chart(fig, width="stretch")
+                            st.caption(f"Base value {explanations.base_value(explainer):.2f}M + contributions = {prediction:.2f}M")
+                        except Exception as e:
+                            st.warning(f"Could not explain this prediction: {e}")
+
+                if global_importance:
+                    with st.expander("Global feature importance (mean |SHAP|)"):
+                        importance = pd.Series(global_importance["features"]).sort_values()
+                        fig = px.bar(x=importance.values, y=importance.index, orientation='h', template='plotly_dark',
+                                     labels={"x": "Mean |SHAP| (M units)", "y": ""})
+                        fig.update_layout(height=400)
+                        st.plotly_chart(fig, width="stretch")
+                        st.caption(f"Computed at training time on {global_importance['sample_size']:,} rows")
+
+        with tab7:
+            st.subheader("Find a Game")
+            query = st.text_input("Search by title", placeholder="e.g. mario kart")
+            if query:
+                with st.spinner("Building title index..."):
+                    title_index = load_title_index()
+                with span("search.query"):
+                    matches = title_index.search(query, limit=20)
+                if not matches:
+                    st.info("No matching titles.")
+                else:
+                    title = st.selectbox(f"Matches ({len(matches)})", matches)
+                    with span("search.lookup"):
+                        versions = title_index.lookup(title)
+
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Platforms", versions["Platform"].nunique())
+                    col2.metric("Global Sales", f"{versions['Global_Sales'].sum():.2f}M")
+                    col3.metric("First Release", int(versions["Year"].min()))
+
+                    st.markdown("### Platform Versions")
+                    st.dataframe(
+                        versions[["Platform", "Year", "Genre", "Publisher"] + analytics.REGIONS + ["Global_Sales"]]
+                        .sort_values("Global_Sales", ascending=False),
+                        hide_index=True, width="stretch",
+                    )
+
+                    st.markdown("### Regional Sales by Platform")
+                    regional = versions.melt(id_vars="Platform", value_vars=analytics.REGIONS,
+                                             var_name="Region", value_name="Sales")
+                    regional["Region"] = regional["Region"].map(dict(zip(analytics.REGIONS, analytics.REGION_NAMES)))
+                    fig = px.bar(regional, x="Region", y="Sales", color="Platform", barmode="stack",
+                                 template="plotly_dark", labels={"Sales": "Sales (Million Units)"})
+                    fig.update_layout(height=450)
+                    st.plotly_chart(fig, width="stretch")
+
+    st.markdown("---")
+    st.markdown("<div style='text-align: center;'>Developed by Streamlit + Plotly + XGBoost</div>", unsafe_allow_html=True)
+
+    if DEBUG_PANEL:
+        with st.sidebar.expander("Debug: timings"):
+            spans = instrumentation.run_spans()
+            if spans:
+                st.dataframe(pd.DataFrame(spans), hide_index=True)
+            st.json(db.get_metrics(), expanded=False)
+            kind = st.radio("Profiler", instrumentation.available_profilers(), horizontal=True)
+            if st.button("Profile next rerun"):
+                st.session_state["_profile_next"] = kind
+            if _profiler is not None:
+                st.success(f"Profile written to {instrumentation.stop_profiler(_profiler, 'rerun')}")
+                _profiler = None
+finally:
+    if _profiler is not None:
+        instrumentation.stop_profiler(_profiler, "rerun")
+    instrumentation.flush()
 
-st.markdown("---")
-st.markdown("<div style='text-align: center;'>Developed by Streamlit + Plotly + XGBoost</div>", unsafe_allow_html=True)
\ No newline at end of file
+if os.getenv("STARTUP_REPORT"):
+    with open(os.getenv("STARTUP_REPORT"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"mode": STARTUP_MODE, **_timings}) + "\n")
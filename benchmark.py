@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the pipeline at production scale against a local SQLite database.
+
+Generates a scaled dataset (generate_data.py), then times CSV ingest, the
+dashboard data load, a dashboard filter plus every tab's aggregation,
+FullPreprocessor.fit_transform/transform, training and single/batch
+predict. Results are written as JSON so runs can be compared across commits.
+
+    python benchmark.py --rows 1000000
+    python benchmark.py --compare benchmark_results/old.json benchmark_results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import analytics
+import db
+import instrumentation
+from generate_data import generate
+
+STAGES = ["ingest", "load", "dashboard", "search", "preprocess", "train", "predict"]
+RESULTS_DIR = Path("benchmark_results")
+# A stage is flagged in --compare when it gets this much slower
+REGRESSION_THRESHOLD = 1.10
+
+
+def measure(fn, repeat=1):
+    """Run ``fn`` ``repeat`` times. Returns (last result, timing summary)."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, summarize(times)
+
+
+def summarize(times):
+    return {
+        "runs": len(times),
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "max_s": round(max(times), 6),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dashboard_pass(df, platforms, genres):
+    df_filtered = analytics.filter_sales(df, platforms, genres)
+    analytics.sales_over_time(df_filtered)
+    analytics.top_sales(df_filtered, "Publisher")
+    analytics.top_sales(df_filtered, "Genre")
+    analytics.top_games(df_filtered)
+    analytics.regional_totals(df_filtered)
+    analytics.platform_genre_heatmap(df_filtered)
+    analytics.correlation_matrix(df_filtered)
+    return df_filtered
+
+
+def run(args):
+    tmp_dir = tempfile.mkdtemp(prefix="game-sales-bench-")
+    try:
+        return _run_stages(args, tmp_dir)
+    finally:
+        # The generated CSV and SQLite file can be several GB at 50M rows
+        db.dispose_engine()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _run_stages(args, tmp_dir):
+    # Imported here so --compare works without the ML stack installed
+    from sklearn.model_selection import train_test_split
+    import init_database
+    import train_model
+
+    stages = args.stages
+    results = {}
+    csv_path = Path(args.csv) if args.csv else Path(tmp_dir) / f"vgsales_{args.rows}.csv"
+
+    if "ingest" in stages and not args.csv:
+        print(f"Generating {args.rows:,} rows...")
+        _, results["generate"] = measure(lambda: generate(args.rows, csv_path, args.seed))
+        results["generate"]["rows"] = args.rows
+
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+    db.dispose_engine()
+    db.reset_metrics()
+
+    rows = None
+    if "ingest" in stages:
+        _, results["ingest"] = measure(lambda: init_database.main(csv_path))
+        rows = results["ingest"]["rows"] = int(db.read_sql("SELECT COUNT(*) AS n FROM vgsales")["n"][0])
+        if not rows:
+            # init_database.main() prints its errors instead of raising them
+            raise SystemExit(f"Ingest loaded no rows from {csv_path}; see the errors above")
+
+    df = None
+    if "load" in stages:
+        df, results["load"] = measure(lambda: db.read_sql(analytics.SALES_QUERY), args.repeat)
+        results["load"]["rows"] = len(df)
+    elif stages - {"ingest"}:
+        # Later stages need the frame even when its load isn't being timed
+        df = db.read_sql(analytics.SALES_QUERY)
+    if df is not None:
+        rows = len(df)
+
+    if "dashboard" in stages:
+        platforms = df["Platform"].value_counts().index[:3].tolist()
+        genres = df["Genre"].value_counts().index[:3].tolist()
+        df_filtered, results["dashboard.filter"] = measure(
+            lambda: analytics.filter_sales(df, platforms, genres), args.repeat)
+        results["dashboard.filter"]["rows"] = len(df_filtered)
+        _, results["dashboard.filtered_pass"] = measure(lambda: dashboard_pass(df, platforms, genres), args.repeat)
+        _, results["dashboard.unfiltered_pass"] = measure(lambda: dashboard_pass(df, None, None), args.repeat)
+
+    if "search" in stages:
+        import search
+        index, results["search.build_index"] = measure(lambda: search.TitleIndex(df))
+        results["search.build_index"]["rows"] = len(df)
+        # What a user has typed so far: 1, 3, 6 and 12 characters of real titles
+        titles = df["Name"].sample(min(25, len(df)), random_state=args.seed).tolist()
+        queries = [t[:n] for t in titles for n in (1, 3, 6, 12)]
+        results["search.query"] = summarize(
+            [measure(lambda q=q: index.search(q, limit=20), args.repeat)[1]["median_s"] for q in queries])
+        results["search.lookup"] = summarize(
+            [measure(lambda t=t: index.lookup(t), args.repeat)[1]["median_s"] for t in titles])
+
+    model = pre = None
+    if stages & {"preprocess", "train", "predict"}:
+        df = train_model.add_features(df[df["Global_Sales"] > 0].copy())
+
+    if "preprocess" in stages:
+        pre, feature_cols = train_model.build_preprocessor()
+        X, y = df[feature_cols], df["Global_Sales"]
+        _, results["preprocess.fit_transform"] = measure(lambda: pre.fit_transform(X, y), args.repeat)
+        _, results["preprocess.transform"] = measure(lambda: pre.transform(X), args.repeat)
+        results["preprocess.fit_transform"]["rows"] = results["preprocess.transform"]["rows"] = len(X)
+
+    if "train" in stages:
+        sample = df.sample(min(args.train_rows, len(df)), random_state=42)
+
+        def train():
+            pre, feature_cols = train_model.build_preprocessor()
+            X_prep = pre.fit_transform(sample[feature_cols], sample["Global_Sales"])
+            X_train, X_test, y_train, y_test = train_test_split(
+                X_prep, sample["Global_Sales"], test_size=0.2, random_state=42
+            )
+            return pre, train_model.train_and_evaluate(X_train, X_test, y_train, y_test)
+
+        (pre, trained), results["train"] = measure(train)
+        results["train"]["rows"] = len(sample)
+        model = trained["xgb"][0]
+
+    if "predict" in stages:
+        if model is None and os.path.exists("models/model_xgb.pkl"):
+            import joblib
+            model = joblib.load("models/model_xgb.pkl")
+            pre = joblib.load("models/preprocessor.pkl")
+        if model is None:
+            print("Skipping predict: no trained model (add the train stage or run train_model.py)")
+        else:
+            _, feature_cols = train_model.build_preprocessor()
+            single = df[feature_cols].iloc[[0]]
+            batch = df[feature_cols].iloc[:args.batch_rows]
+            _, results["predict.single"] = measure(lambda: model.predict(pre.transform(single)), max(args.repeat, 50))
+            _, results["predict.batch"] = measure(lambda: model.predict(pre.transform(batch)), args.repeat)
+            results["predict.batch"]["rows"] = len(batch)
+
+            import explanations
+            explainer, results["explain.build"] = measure(lambda: explanations.get_explainer(model, "benchmark"))
+            single_prep, batch_prep = pre.transform(single), pre.transform(batch)
+            _, results["explain.single"] = measure(
+                lambda: explanations.explain(explainer, pre, single_prep), max(args.repeat, 50))
+            _, results["explain.batch"] = measure(lambda: explanations.explain(explainer, pre, batch_prep), args.repeat)
+            results["explain.batch"]["rows"] = len(batch)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            # What was actually benchmarked, not --rows (nothing is generated without ingest)
+            "rows": rows,
+            "csv": str(args.csv) if args.csv else None,
+            "backend": db.get_engine().dialect.name,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+        "spans": {name: {"count": s["count"], "sum_s": round(s["sum"], 6)}
+                  for name, s in instrumentation.get_stats().items()},
+        "db": db.get_metrics(),
+    }
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}")
+    print(f"{'stage':28s}{'old (s)':>12s}{'new (s)':>12s}{'ratio':>9s}")
+    regressions = 0
+    for stage, r in new["results"].items():
+        before = old["results"].get(stage)
+        if not before:
+            print(f"{stage:28s}{'-':>12s}{r['median_s']:>12.4f}{'-':>9s}")
+            continue
+        ratio = r["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        regressions += bool(flag)
+        print(f"{stage:28s}{before['median_s']:>12.4f}{r['median_s']:>12.4f}{ratio:>9.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest, dashboard, preprocessing, training and predict")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic rows to generate (1M-50M)")
+    parser.add_argument("--csv", help="use an existing CSV instead of generating one")
+    parser.add_argument("--database-url", help="default: a fresh SQLite file in a temp directory "
+                                               "(then the ingest stage is required)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage (ingest/train run once)")
+    parser.add_argument("--train-rows", type=int, default=50_000, help="training sample size")
+    parser.add_argument("--batch-rows", type=int, default=100_000, help="rows per batch predict")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="result file (default: benchmark_results/<time>-<commit>-<rows>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    args.stages = set(args.stages)
+    if "ingest" not in args.stages and not args.database_url:
+        # The default database is a fresh, empty temp file
+        parser.error("stages other than ingest need the ingest stage or --database-url")
+    if args.csv and "ingest" in args.stages and not Path(args.csv).is_file():
+        parser.error(f"--csv {args.csv} not found")
+    report = run(args)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / "{}-{}-{}.json".format(
+        datetime.now().strftime("%Y%m%d-%H%M%S"), report["meta"]["commit"] or "nogit", report["meta"]["rows"])
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print("\n" + "=" * 60)
+    print(" BENCHMARK RESULTS (median seconds)")
+    print("=" * 60)
+    for stage, r in report["results"].items():
+        rows = f"{r['rows']:,} rows" if r.get("rows") is not None else ""
+        print(f"{stage:28s}{r['median_s']:>12.4f}  {rows}")
+    print(f"\nSaved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""Shared database connection management.
+
+Every entry point (app.py, train_model.py, init_database.py) gets its engine
+from here, so a process holds exactly one pooled engine and reuses warm
+connections instead of building a new engine per call.
+
+The backend is chosen by URL:
+
+* ``DATABASE_URL`` if set, e.g. ``sqlite:///data/game_sales.db`` or
+  ``duckdb:///data/game_sales.duckdb`` (needs ``duckdb-engine``)
+* otherwise MySQL built from ``DB_USER`` / ``DB_PASSWORD`` / ``DB_HOST`` / ``DB_NAME``
+
+Pool settings come from ``DB_POOL_SIZE``, ``DB_MAX_OVERFLOW``,
+``DB_POOL_RECYCLE`` and ``DB_POOL_PRE_PING``.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import (
+    CheckConstraint, Column, Float, ForeignKey, Index, Integer, MetaData,
+    Sequence, String, Table, UniqueConstraint, create_engine, event, insert, text,
+)
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+load_dotenv()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+# -------------------------------------------------------
+# Schema (local backends only; MySQL uses game_sales_schema.sql)
+# -------------------------------------------------------
+metadata = MetaData()
+
+platform_table = Table(
+    "platform", metadata,
+    Column("id", Integer, Sequence("platform_id_seq"), primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+)
+
+genre_table = Table(
+    "genre", metadata,
+    Column("id", Integer, Sequence("genre_id_seq"), primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+)
+
+publisher_table = Table(
+    "publisher", metadata,
+    Column("id", Integer, Sequence("publisher_id_seq"), primary_key=True),
+    Column("name", String(100), nullable=False, unique=True),
+)
+
+vgsales_table = Table(
+    "vgsales", metadata,
+    Column("id", Integer, Sequence("vgsales_id_seq"), primary_key=True),
+    Column("Rank", Integer),
+    Column("game_name", String(255), nullable=False),
+    Column("platform_id", Integer, ForeignKey("platform.id"), nullable=False),
+    Column("genre_id", Integer, ForeignKey("genre.id"), nullable=False),
+    Column("publisher_id", Integer, ForeignKey("publisher.id"), nullable=False),
+    Column("Year", Integer, nullable=False),
+    Column("NA_Sales", Float, default=0),
+    Column("EU_Sales", Float, default=0),
+    Column("JP_Sales", Float, default=0),
+    Column("Other_Sales", Float, default=0),
+    Column("Global_Sales", Float, default=0),
+    CheckConstraint("Year >= 1970 AND Year <= 2050", name="ck_year"),
+    CheckConstraint("Global_Sales >= 0", name="ck_global_sales"),
+    UniqueConstraint("game_name", "platform_id", "Year", name="uq_game"),
+    Index("idx_platform_year", "platform_id", "Year"),
+    Index("idx_genre_year", "genre_id", "Year"),
+    Index("idx_year", "Year"),
+)
+
+TABLES = {t.name: t for t in (platform_table, genre_table, publisher_table, vgsales_table)}
+
+
+# -------------------------------------------------------
+# Engine
+# -------------------------------------------------------
+def get_database_url():
+    """Return the configured database URL (DATABASE_URL wins over DB_* vars)."""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    DB_USER = os.getenv("DB_USER", "root")
+    DB_PASSWORD = os.getenv("DB_PASSWORD")
+    DB_HOST = os.getenv("DB_HOST", "localhost")
+    DB_NAME = os.getenv("DB_NAME", "game_sales")
+
+    if not DB_PASSWORD:
+        raise ValueError("Please set DB_PASSWORD (or DATABASE_URL) in the .env file")
+
+    return f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _engine_kwargs(url):
+    kwargs = {
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    backend = url.get_backend_name()
+    in_memory = backend in ("sqlite", "duckdb") and url.database in (None, "", ":memory:")
+
+    if in_memory:
+        # Every connection to an in-memory database is a new, empty database,
+        # so share a single connection across the whole process.
+        kwargs["poolclass"] = StaticPool
+    else:
+        kwargs["poolclass"] = QueuePool
+        kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
+        kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+    if backend == "sqlite":
+        # Pooled connections are handed to whichever thread checks them out
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return kwargs
+
+
+def get_engine():
+    """Return the process-wide pooled engine, creating it on first use."""
+    global _engine
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            url = make_url(get_database_url())
+            engine = create_engine(url, **_engine_kwargs(url))
+            _instrument(engine)
+            _engine = engine
+    return _engine
+
+
+def dispose_engine():
+    """Close all pooled connections and forget the engine (e.g. after fork or in benchmarks)."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def is_mysql(engine=None):
+    engine = engine or get_engine()
+    return engine.dialect.name == "mysql"
+
+
+def ensure_schema(engine=None):
+    """Create the tables on local backends. MySQL is set up from game_sales_schema.sql."""
+    engine = engine or get_engine()
+    if is_mysql(engine):
+        return
+    metadata.create_all(engine, checkfirst=True)
+
+
+def insert_ignore(table):
+    """INSERT statement that skips rows violating a unique key, on every supported backend."""
+    if isinstance(table, str):
+        table = TABLES[table]
+    return (
+        insert(table)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .prefix_with("OR IGNORE", dialect="duckdb")
+    )
+
+
+# -------------------------------------------------------
+# Connections & queries
+# -------------------------------------------------------
+@contextmanager
+def connect():
+    """Check a connection out of the pool, recording how long the checkout took."""
+    engine = get_engine()
+    start = time.perf_counter()
+    conn = engine.connect()
+    _observe("connection_acquire", time.perf_counter() - start)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def read_sql(query, params=None):
+    """Run a SELECT on a pooled connection and return it as a DataFrame."""
+    with connect() as conn:
+        return pd.read_sql(text(query), conn, params=params)
+
+
+# -------------------------------------------------------
+# Metrics
+# -------------------------------------------------------
+def _observe(name, seconds):
+    with _metrics_lock:
+        m = _metrics.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+        m["count"] += 1
+        m["total_s"] += seconds
+        m["max_s"] = max(m["max_s"], seconds)
+
+
+def _count(name):
+    with _metrics_lock:
+        m = _metrics.setdefault(name, {"count": 0})
+        m["count"] += 1
+
+
+def _instrument(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _observe("query", time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        # after_cursor_execute never fires for a failed statement
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            _observe("query", time.perf_counter() - conn.info["query_start"].pop())
+        _count("query_errors")
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(dbapi_conn, record):
+        _count("connections_opened")
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        _count("checkouts")
+
+
+def get_metrics():
+    """Snapshot of connection-acquire / query-latency / query-error metrics and current pool state."""
+    with _metrics_lock:
+        snapshot = {name: dict(m) for name, m in _metrics.items()}
+
+    for m in snapshot.values():
+        if "total_s" in m:
+            m["avg_s"] = m["total_s"] / m["count"] if m["count"] else 0.0
+
+    if _engine is not None:
+        pool = _engine.pool
+        snapshot["pool"] = {
+            "backend": _engine.dialect.name,
+            "class": type(pool).__name__,
+            "status": pool.status(),
+        }
+        if isinstance(pool, QueuePool):
+            snapshot["pool"].update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+    return snapshot
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""SHAP feature attributions for the XGBoost model.
+
+One TreeExplainer is built per model version (hash of the model pickle) and
+reused. Global importance is computed once at training time and stored next
+to the model, so the dashboard only ever explains the rows it predicts.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = "models/model_xgb.pkl"
+IMPORTANCE_PATH = "models/shap_importance.json"
+# Rows per shap_values() call on the batch path
+BATCH_SIZE = 10_000
+# Rows sampled for global importance at training time
+SAMPLE_SIZE = 2_000
+
+_explainers = {}
+_lock = threading.Lock()
+
+
+def model_version(path=MODEL_PATH):
+    """Short content hash of the saved model; changes whenever it is retrained."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def get_explainer(model, version):
+    """TreeExplainer for ``model``, built once per model version."""
+    with _lock:
+        explainer = _explainers.get(version)
+        if explainer is None:
+            import shap
+            explainer = _explainers[version] = shap.TreeExplainer(model)
+    return explainer
+
+
+def base_value(explainer):
+    return float(np.ravel(explainer.expected_value)[0])
+
+
+def _source_features(preprocessor):
+    """Map each preprocessed column to the input feature it came from (Platform_Wii -> Platform).
+
+    Built from the fitted encoder's categories, not name prefixes, since
+    Platform_Count is a numeric column and not a Platform category.
+    """
+    mapping = {name: name for name in list(preprocessor.te_cols) + list(preprocessor.num_cols)}
+    ohe_names = preprocessor.ohe.get_feature_names_out(preprocessor.ohe_cols)
+    ohe_sources = [col for col, cats in zip(preprocessor.ohe_cols, preprocessor.ohe.categories_) for _ in cats]
+    mapping.update(zip(ohe_names, ohe_sources))
+    return mapping
+
+
+def explain(explainer, preprocessor, X, batch_size=BATCH_SIZE, grouped=True):
+    """SHAP values for the rows of the preprocessed matrix ``X``, computed in batches.
+
+    With ``grouped`` the one-hot columns are summed back into their source
+    feature, so the result has one column per model input.
+    """
+    X = np.asarray(X)
+    names = preprocessor.get_feature_names()
+    if len(X) == 0:
+        values = np.empty((0, len(names)))
+    else:
+        values = np.vstack([
+            explainer.shap_values(X[start:start + batch_size])
+            for start in range(0, len(X), batch_size)
+        ])
+    contrib = pd.DataFrame(values, columns=names)
+    if grouped:
+        mapping = _source_features(preprocessor)
+        inputs = list(preprocessor.te_cols) + list(preprocessor.ohe_cols) + list(preprocessor.num_cols)
+        if set(mapping) != set(names):
+            raise ValueError("Preprocessed feature names do not match the fitted encoders")
+        contrib = contrib.T.groupby(mapping, sort=False).sum().T
+        if list(contrib.columns) != inputs:
+            raise ValueError(f"Grouped SHAP columns {list(contrib.columns)} != model inputs {inputs}")
+    return contrib
+
+
+def compute_global_importance(model, preprocessor, X, sample_size=SAMPLE_SIZE, seed=42):
+    """Mean |SHAP| per input feature over a sample of ``X``, largest first."""
+    X = np.asarray(X)
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(X), size=min(sample_size, len(X)), replace=False)
+
+    import shap
+    explainer = shap.TreeExplainer(model)
+    contrib = explain(explainer, preprocessor, X[rows])
+    importance = contrib.abs().mean().sort_values(ascending=False)
+    return {
+        "base_value": base_value(explainer),
+        "sample_size": len(rows),
+        "features": {k: float(v) for k, v in importance.items()},
+    }
+
+
+def save_global_importance(model, preprocessor, X, path=IMPORTANCE_PATH, model_path=MODEL_PATH):
+    """Compute global importance and store it next to the saved model."""
+    summary = {"model_version": model_version(model_path),
+               **compute_global_importance(model, preprocessor, X)}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def load_global_importance(version, path=IMPORTANCE_PATH):
+    """Stored global importance, or None if missing or from a different model version."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return summary if summary.get("model_version") == version else None
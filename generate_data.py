@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Scale data/vgsales.csv up to millions of rows for benchmarking.
+
+Rows are resampled from the real dataset, so the joint platform / genre /
+publisher / year distribution is kept. Regional sales get log-normal noise
+and Global_Sales is recomputed from them. Repeated titles get a " #<n>"
+suffix so (game_name, platform, Year) stays unique, as the schema requires.
+
+    python generate_data.py --rows 1000000 --out data/vgsales_1m.csv
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SOURCE_CSV = Path(__file__).parent / "data" / "vgsales.csv"
+REGIONS = ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
+CHUNK_SIZE = 1_000_000
+
+
+def generate(rows, out_path, seed=42, source=SOURCE_CSV, chunk_size=CHUNK_SIZE):
+    """Write ``rows`` synthetic rows to ``out_path`` in chunks. Returns the path."""
+    base = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    seen = np.zeros(len(base), dtype=np.int64)
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    while written < rows:
+        n = min(chunk_size, rows - written)
+        idx = rng.integers(0, len(base), size=n)
+        chunk = base.iloc[idx].reset_index(drop=True)
+
+        # n-th copy of a source row overall (0 = first, keeps the real title)
+        occurrence = pd.Series(idx).groupby(idx).cumcount().to_numpy() + seen[idx]
+        seen += np.bincount(idx, minlength=len(base))
+        suffix = pd.Series(occurrence).astype(str)
+        chunk["Name"] = chunk["Name"].where(occurrence == 0, chunk["Name"] + " #" + suffix)
+
+        noise = rng.lognormal(mean=0.0, sigma=0.25, size=(n, len(REGIONS)))
+        chunk[REGIONS] = (chunk[REGIONS].to_numpy() * noise).round(2)
+        chunk["Global_Sales"] = chunk[REGIONS].sum(axis=1).round(2)
+        chunk["Rank"] = np.arange(written + 1, written + n + 1)
+
+        chunk.to_csv(out_path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += n
+        print(f"  ... Generated {written:,}/{rows:,} rows")
+
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a scaled synthetic vgsales CSV")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", default="data/vgsales_synthetic.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = generate(args.rows, args.out, args.seed)
+    print(f"\nWrote {args.rows:,} rows to {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
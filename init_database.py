@@ -1,47 +1,39 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from pathlib import Path
-import os
-from dotenv import load_dotenv
+import db
+import instrumentation
+from instrumentation import span
 
-# Load variables from .env
-load_dotenv()
-
-# Create connection string from environment variables
-DB_USER = os.getenv("DB_USER", "root")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_NAME = os.getenv("DB_NAME", "game_sales")
-
-if not DB_PASSWORD:
-    raise ValueError("Please set DB_PASSWORD in the .env file")
-
-engine = create_engine(f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}")
+# Rows per ingest batch (one timing span and one progress line each)
+BATCH_SIZE = 1000
 
 
 def insert_unique(table, values):
-    """Insert unique items safely using INSERT IGNORE."""
-    with engine.begin() as conn:
+    """Insert unique items safely (INSERT IGNORE / INSERT OR IGNORE)."""
+    stmt = db.insert_ignore(table)
+    with db.get_engine().begin() as conn:
         for v in values:
-            conn.execute(
-                text(f"INSERT IGNORE INTO {table} (name) VALUES (:val)"),
-                {"val": v}
-            )
+            conn.execute(stmt, {"name": v})
 
 
-def main():
+def main(csv_path=None):
     try:
+        engine = db.get_engine()
+        db.ensure_schema(engine)
+
         print("Loading CSV...")
         
-        # Use relative path
-        csv_path = Path(__file__).parent / "data" / "vgsales.csv"
+        # Use relative path (benchmark.py passes a generated CSV instead)
+        csv_path = Path(csv_path or Path(__file__).parent / "data" / "vgsales.csv")
         
         # Check if file exists
         if not csv_path.exists():
             raise FileNotFoundError(f"CSV file not found at: {csv_path}")
         
-        df = pd.read_csv(csv_path)
+        with span("ingest.read_csv"):
+            df = pd.read_csv(csv_path)
         print(f"Data loaded successfully: {len(df):,} rows")
 
         print("\nCleaning data...")
@@ -52,21 +44,23 @@ def main():
         # INSERT UNIQUE DIMENSION VALUES (SAFE)
         print("\nInserting Platform/Genre/Publisher data...")
 
-        insert_unique("platform", df["Platform"].unique())
-        print(f"  Platform: {df['Platform'].nunique()} items")
-        
-        insert_unique("genre", df["Genre"].unique())
-        print(f"  Genre: {df['Genre'].nunique()} items")
-        
-        insert_unique("publisher", df["Publisher"].unique())
-        print(f"  Publisher: {df['Publisher'].nunique()} items")
+        with span("ingest.dimensions"):
+            insert_unique("platform", df["Platform"].unique())
+            print(f"  Platform: {df['Platform'].nunique()} items")
+            
+            insert_unique("genre", df["Genre"].unique())
+            print(f"  Genre: {df['Genre'].nunique()} items")
+            
+            insert_unique("publisher", df["Publisher"].unique())
+            print(f"  Publisher: {df['Publisher'].nunique()} items")
 
         # LOAD ID MAPPING
         print("\nLoading ID mapping...")
 
-        plat_map = pd.read_sql("SELECT id, name FROM platform", engine).set_index("name")["id"]
-        genre_map = pd.read_sql("SELECT id, name FROM genre", engine).set_index("name")["id"]
-        pub_map = pd.read_sql("SELECT id, name FROM publisher", engine).set_index("name")["id"]
+        with span("ingest.id_mapping"):
+            plat_map = db.read_sql("SELECT id, name FROM platform").set_index("name")["id"]
+            genre_map = db.read_sql("SELECT id, name FROM genre").set_index("name")["id"]
+            pub_map = db.read_sql("SELECT id, name FROM publisher").set_index("name")["id"]
 
         # Map to FK
         df["platform_id"] = df["Platform"].map(plat_map)
@@ -84,39 +78,32 @@ def main():
         print("\nInserting data into vgsales table...")
 
         inserted_count = 0
+        stmt = db.insert_ignore("vgsales")
         with engine.begin() as conn:
-            for idx, row in df.iterrows():
-                try:
-                    conn.execute(text("""
-                        INSERT IGNORE INTO vgsales
-                        (`Rank`, game_name, Year,
-                         NA_Sales, EU_Sales, JP_Sales, Other_Sales, Global_Sales,
-                         platform_id, genre_id, publisher_id)
-                        VALUES
-                        (:rank, :name, :year,
-                         :na, :eu, :jp, :other, :global,
-                         :platform, :genre, :publisher)
-                    """), {
-                        "rank": int(row["Rank"]),
-                        "name": str(row["Name"]),
-                        "year": int(row["Year"]),
-                        "na": float(row["NA_Sales"]),
-                        "eu": float(row["EU_Sales"]),
-                        "jp": float(row["JP_Sales"]),
-                        "other": float(row["Other_Sales"]),
-                        "global": float(row["Global_Sales"]),
-                        "platform": int(row["platform_id"]),
-                        "genre": int(row["genre_id"]),
-                        "publisher": int(row["publisher_id"]),
-                    })
-                    inserted_count += 1
-                    
-                    if (idx + 1) % 1000 == 0:
-                        print(f"  ... Processed {idx + 1:,}/{len(df):,} rows")
-                        
-                except Exception as e:
-                    print(f"Error at row {idx}: {e}")
-                    continue
+            for start in range(0, len(df), BATCH_SIZE):
+                batch = df.iloc[start:start + BATCH_SIZE]
+                with span("ingest.vgsales_batch", rows=len(batch)):
+                    for idx, row in batch.iterrows():
+                        try:
+                            conn.execute(stmt, {
+                                "Rank": int(row["Rank"]),
+                                "game_name": str(row["Name"]),
+                                "Year": int(row["Year"]),
+                                "NA_Sales": float(row["NA_Sales"]),
+                                "EU_Sales": float(row["EU_Sales"]),
+                                "JP_Sales": float(row["JP_Sales"]),
+                                "Other_Sales": float(row["Other_Sales"]),
+                                "Global_Sales": float(row["Global_Sales"]),
+                                "platform_id": int(row["platform_id"]),
+                                "genre_id": int(row["genre_id"]),
+                                "publisher_id": int(row["publisher_id"]),
+                            })
+                            inserted_count += 1
+                        except Exception as e:
+                            print(f"Error at row {idx}: {e}")
+                            continue
+
+                print(f"  ... Processed {start + len(batch):,}/{len(df):,} rows")
 
         print(f"\nData inserted successfully: {inserted_count:,} rows")
         print("\nDatabase preparation completed!")
@@ -140,9 +127,12 @@ def main():
         print("Please check if vgsales.csv exists in the 'data' folder")
     except ValueError as e:
         print(f"\nConfiguration Error: {e}")
+        raise
     except Exception as e:
         print(f"\nUnexpected Error: {e}")
         raise
+    finally:
+        instrumentation.flush()
 
 
 if __name__ == "__main__":
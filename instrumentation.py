@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Timing spans, trace/Prometheus output and profiling hooks.
+
+Wrap a hot path in ``span()`` (or decorate it with ``timed()``) and every
+call is aggregated in memory. Output is controlled by environment variables:
+
+* ``TRACE_FILE``       append one JSON line per span (e.g. ``logs/trace.jsonl``)
+* ``PROMETHEUS_FILE``  Prometheus text format, rewritten on ``flush()``
+* ``METRICS_PORT``     serve the same text at ``http://<METRICS_HOST>:<port>/metrics``
+* ``METRICS_HOST``     interface to bind (default ``127.0.0.1``)
+"""
+import cProfile
+import functools
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram buckets in seconds, from a cached filter up to a full training run
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+PROFILE_DIR = "profiles"
+
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+_server = None
+_server_failed = False
+log = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------
+# Spans
+# -------------------------------------------------------
+def _record(name, duration, attrs, error):
+    with _lock:
+        s = _stats.get(name)
+        if s is None:
+            s = _stats[name] = {"count": 0, "sum": 0.0, "errors": 0, "buckets": [0] * len(BUCKETS)}
+        s["count"] += 1
+        s["sum"] += duration
+        if error:
+            s["errors"] += 1
+        for i, le in enumerate(BUCKETS):
+            if duration <= le:
+                s["buckets"][i] += 1
+
+    event = {"span": name, "duration_s": round(duration, 6), **attrs}
+    if error:
+        event["error"] = error
+
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.append(event)
+
+    trace_file = os.getenv("TRACE_FILE")
+    if trace_file:
+        event = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            **event,
+        }
+        with _lock:
+            os.makedirs(os.path.dirname(trace_file) or ".", exist_ok=True)
+            with open(trace_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, default=str) + "\n")
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block under ``name``; extra keyword args go into the trace line."""
+    error = None
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _record(name, time.perf_counter() - start, attrs, error)
+
+
+def timed(name):
+    """Decorator form of ``span()``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_run():
+    """Start collecting the spans recorded on this thread (one Streamlit rerun)."""
+    _local.run = []
+
+
+def run_spans():
+    """Spans recorded on this thread since ``begin_run()``."""
+    return list(getattr(_local, "run", None) or [])
+
+
+def collect(fn, *args, **kwargs):
+    """Call ``fn`` (e.g. on a worker thread) and return ``(result, spans it recorded)``."""
+    begin_run()
+    return fn(*args, **kwargs), run_spans()
+
+
+def adopt(spans):
+    """Add spans recorded on another thread (see ``collect()``) to this thread's run."""
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.extend(spans)
+
+
+def get_stats():
+    with _lock:
+        return {name: dict(s, buckets=list(s["buckets"])) for name, s in _stats.items()}
+
+
+# -------------------------------------------------------
+# Prometheus
+# -------------------------------------------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """All span histograms plus the shared engine's DB metrics, in Prometheus text format."""
+    lines = [
+        "# HELP game_sales_span_duration_seconds Duration of instrumented spans.",
+        "# TYPE game_sales_span_duration_seconds histogram",
+    ]
+    stats = get_stats()
+    for name, s in sorted(stats.items()):
+        label = f'span="{_escape(name)}"'
+        for le, n in zip(BUCKETS, s["buckets"]):
+            lines.append(f'game_sales_span_duration_seconds_bucket{{{label},le="{le}"}} {n}')
+        lines.append(f'game_sales_span_duration_seconds_bucket{{{label},le="+Inf"}} {s["count"]}')
+        lines.append(f"game_sales_span_duration_seconds_sum{{{label}}} {s['sum']:.6f}")
+        lines.append(f"game_sales_span_duration_seconds_count{{{label}}} {s['count']}")
+
+    lines += [
+        "# HELP game_sales_span_errors_total Spans that exited with an exception.",
+        "# TYPE game_sales_span_errors_total counter",
+    ]
+    for name, s in sorted(stats.items()):
+        lines.append(f'game_sales_span_errors_total{{span="{_escape(name)}"}} {s["errors"]}')
+
+    # Imported here so scripts that never touch the database don't pay for it
+    import db
+    db_metrics = db.get_metrics()
+    for key in ("query", "connection_acquire"):
+        m = db_metrics.get(key)
+        if m:
+            metric = f"game_sales_db_{key}_seconds"
+            lines += [f"# TYPE {metric} summary",
+                      f"{metric}_sum {m['total_s']:.6f}",
+                      f"{metric}_count {m['count']}"]
+    for key in ("connections_opened", "checkouts", "query_errors"):
+        m = db_metrics.get(key)
+        if m:
+            metric = f"game_sales_db_{key}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {m['count']}"]
+    pool = db_metrics.get("pool", {})
+    if "checked_out" in pool:
+        lines += ["# TYPE game_sales_db_pool_checked_out gauge",
+                  f"game_sales_db_pool_checked_out {pool['checked_out']}"]
+
+    return "\n".join(lines) + "\n"
+
+
+def flush():
+    """Rewrite PROMETHEUS_FILE (if set) with the current metrics."""
+    path = os.getenv("PROMETHEUS_FILE")
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port=None, host=None):
+    """Serve /metrics on a daemon thread (once per process). Uses METRICS_PORT if no port given.
+
+    Binds to METRICS_HOST (default 127.0.0.1); the endpoint has no auth.
+    """
+    global _server, _server_failed
+    port = port or os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+    with _lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError as e:
+                # e.g. port taken by another Streamlit process; metrics are optional
+                _server_failed = True
+                log.warning("Could not serve metrics on %s:%s: %s", host, port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
+
+
+# -------------------------------------------------------
+# Profiling
+# -------------------------------------------------------
+def available_profilers():
+    profilers = ["cprofile"]
+    if importlib.util.find_spec("pyinstrument") is not None:
+        profilers.append("pyinstrument")
+    return profilers
+
+
+def start_profiler(kind="cprofile"):
+    """Start profiling the current thread with cProfile or pyinstrument."""
+    if kind == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profiler(profiler, label="run"):
+    """Stop the profiler and write its report to PROFILE_DIR. Returns the report path."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        path = os.path.join(PROFILE_DIR, f"{label}-{stamp}.prof")
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = os.path.join(PROFILE_DIR, f"{label}-{stamp}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+    return path
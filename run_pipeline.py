@@ -13,6 +13,16 @@ def run_command(command, description):
         print(f"Error details: {e}")
         sys.exit(1)
 
+def uses_mysql():
+    # Imported here: the requirements are only installed once main() starts
+    from sqlalchemy.engine import make_url
+    import db
+    try:
+        return make_url(db.get_database_url()).get_backend_name() == "mysql"
+    except ValueError:
+        # Neither DATABASE_URL nor DB_PASSWORD set; init_database.py reports it
+        return True
+
 def main():
     print("="*50)
     print(" GAME SALES PROJECT: AUTOMATED PIPELINE")
@@ -21,8 +31,11 @@ def main():
     print("\nChecking dependencies...")
     run_command("pip install -r requirements.txt", "Installing Requirements")
 
-    print("\nEnsure you have imported 'game_sales_schema.sql' into MySQL first!")
-    time.sleep(2) 
+    if uses_mysql():
+        print("\nEnsure you have imported 'game_sales_schema.sql' into MySQL first!")
+        time.sleep(2)
+    else:
+        print("\nUsing DATABASE_URL: init_database.py creates the tables")
     
     if not os.path.exists(os.path.join("data", "vgsales.csv")):
         print("\nFile not found: Please place 'vgsales.csv' in the 'data/' folder.")
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Game-title search and per-title lookups.
+
+``TitleIndex`` is built once over the loaded sales frame:
+
+* a sorted token vocabulary with postings (token -> title ids), so every
+  query word is matched as a prefix with two binary searches, like a trie
+* title ids ordered by total Global_Sales, so the best-selling matches are
+  simply the smallest ids and no full scan is needed to rank them
+* the normalized titles in sorted order, so the titles starting with the
+  query are one more pair of binary searches
+* the row positions of every title, so a drill-down is a keyed slice
+  instead of a filter over the whole frame
+"""
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+_TOKEN = re.compile(r"\w+")
+# Highest code point; "abc" + _MAX_CHAR sorts after every token starting with "abc"
+_MAX_CHAR = "\U0010ffff"
+
+
+def tokenize(title):
+    return _TOKEN.findall(str(title).lower())
+
+
+def _offsets(counts):
+    return np.concatenate(([0], np.cumsum(counts)))
+
+
+def _gather(starts, lengths):
+    """Concatenated ranges ``starts[i]:starts[i] + lengths[i]`` as one index array."""
+    ends = np.cumsum(lengths)
+    return np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - lengths - starts, lengths)
+
+
+class TitleIndex:
+    def __init__(self, df):
+        self.df = df
+
+        codes, names = pd.factorize(df["Name"])
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=df["Global_Sales"].to_numpy()[valid], minlength=len(names))
+
+        # Title id = popularity rank (0 = best-selling)
+        rank = np.argsort(-totals, kind="stable")
+        code_to_id = np.empty_like(rank)
+        code_to_id[rank] = np.arange(len(rank))
+        self.titles = np.asarray(names, dtype=object)[rank]
+        self._title_ids = pd.Index(self.titles)
+
+        # Rows of each title
+        row_ids = code_to_id[codes[valid]]
+        self._rows = np.flatnonzero(valid)[np.argsort(row_ids, kind="stable")]
+        self._row_off = _offsets(np.bincount(row_ids, minlength=len(self.titles)))
+
+        # Tokens of each title, and titles of each token
+        tokens = [tokenize(t) for t in self.titles]
+        lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+        token_codes, vocab = pd.factorize(pd.Series(list(chain.from_iterable(tokens)), dtype=object), sort=True)
+        self._vocab = np.asarray(vocab, dtype=object)
+        self._title_tokens = token_codes
+        self._title_tok_off = _offsets(lengths)
+
+        token_titles = np.repeat(np.arange(len(self.titles)), lengths)
+        # Stable sort keeps each token's postings in popularity order
+        self._postings = token_titles[np.argsort(token_codes, kind="stable")]
+        self._post_off = _offsets(np.bincount(token_codes, minlength=len(self._vocab)))
+
+        # Titles as their lower-cased tokens joined by single spaces, sorted
+        normalized = np.array([" ".join(t) for t in tokens], dtype=object)
+        self._norm_order = np.argsort(normalized)
+        self._norm_sorted = normalized[self._norm_order]
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _vocab_range(self, prefix):
+        lo = np.searchsorted(self._vocab, prefix, side="left")
+        hi = np.searchsorted(self._vocab, prefix + _MAX_CHAR, side="left")
+        return int(lo), int(hi)
+
+    def _starting_with(self, phrase, limit):
+        """Up to ``limit`` best-selling title ids whose normalized title starts with ``phrase``."""
+        lo = np.searchsorted(self._norm_sorted, phrase, side="left")
+        hi = np.searchsorted(self._norm_sorted, phrase + _MAX_CHAR, side="left")
+        ids = self._norm_order[lo:hi]
+        if len(ids) > limit:
+            ids = np.partition(ids, limit - 1)[:limit]
+        return np.sort(ids)
+
+    def _candidates(self, lo, hi, pool):
+        """Up to ``pool`` smallest title ids with a token in vocab[lo:hi], and whether that is all of them."""
+        starts = self._post_off[lo:hi]
+        full = self._post_off[lo + 1:hi + 1] - starts
+        lengths = np.minimum(full, pool)
+        ids = np.unique(self._postings[_gather(starts, lengths)])
+        return ids[:pool], bool((lengths == full).all()) and len(ids) <= pool
+
+    def _has_token_in(self, ids, lo, hi):
+        """Mask of ``ids`` whose titles have a token in vocab[lo:hi]."""
+        starts = self._title_tok_off[ids]
+        lengths = self._title_tok_off[ids + 1] - starts
+        codes = self._title_tokens[_gather(starts, lengths)]
+        owner = np.repeat(np.arange(len(ids)), lengths)
+        hit = (codes >= lo) & (codes < hi)
+        return np.bincount(owner[hit], minlength=len(ids)) > 0
+
+    def search(self, query, limit=10):
+        """Titles containing every query word as a word prefix.
+
+        Titles starting with the query come first, then by total sales.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        ranges = [self._vocab_range(w) for w in words]
+        if limit <= 0 or any(lo == hi for lo, hi in ranges):
+            return []
+        # Every title starting with the query also matches word by word
+        starts = self._starting_with(" ".join(words), limit)
+
+        # Start from the word with the fewest postings
+        ranges.sort(key=lambda r: self._post_off[r[1]] - self._post_off[r[0]])
+        first, rest = ranges[0], ranges[1:]
+
+        # The best-selling word matches, plus room for the ones already in ``starts``;
+        # widen the pool only if later words filter too many out
+        want = limit + len(starts)
+        pool = max(want * 4, 1000)
+        while True:
+            ids, complete = self._candidates(*first, pool)
+            for lo, hi in rest:
+                ids = ids[self._has_token_in(ids, lo, hi)]
+            if len(ids) >= want or complete:
+                break
+            pool *= 4
+
+        others = ids[:want][~np.isin(ids[:want], starts)]
+        return list(self.titles[np.concatenate((starts, others))[:limit]])
+
+    def lookup(self, title):
+        """All rows (platform versions) of ``title``."""
+        if title not in self._title_ids:
+            return self.df.iloc[0:0]
+        i = self._title_ids.get_loc(title)
+        return self.df.iloc[self._rows[self._row_off[i]:self._row_off[i + 1]]]
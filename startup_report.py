@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Measure dashboard time-to-first-paint: sequential (old) vs parallel startup.
+
+Each run is a fresh Python process, so import costs are included.
+
+    python startup_report.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUN_APP = (
+    "from streamlit.testing.v1 import AppTest\n"
+    "AppTest.from_file('app.py', default_timeout=600).run()\n"
+)
+
+MARKS = ["data_ready", "first_paint", "model_ready"]
+
+
+def measure(mode, runs):
+    fd, report = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        env = dict(os.environ, STARTUP_MODE=mode, STARTUP_REPORT=report)
+        for _ in range(runs):
+            subprocess.run([sys.executable, "-c", RUN_APP], env=env, check=True)
+        with open(report, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    finally:
+        os.remove(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(" DASHBOARD STARTUP REPORT (median seconds from script start)")
+    print("=" * 60)
+    print(f"{'mode':12s}" + "".join(f"{m:>14s}" for m in MARKS))
+
+    for mode in ("sequential", "parallel"):
+        results = measure(mode, args.runs)
+        row = f"{mode:12s}"
+        for m in MARKS:
+            values = [r[m] for r in results if m in r]
+            row += f"{statistics.median(values):>14.3f}" if values else f"{'-':>14s}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
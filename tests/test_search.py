@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""TitleIndex against a brute-force scan of every title."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from search import TitleIndex, _gather, tokenize  # noqa: E402
+
+VGSALES = Path(__file__).resolve().parent.parent / "data" / "vgsales.csv"
+
+
+def ranked_titles(df):
+    """(title, tokens) by total sales, summed row by row like np.bincount; ties keep first appearance."""
+    totals = {}
+    for name, sales in zip(df["Name"], df["Global_Sales"]):
+        if isinstance(name, str):
+            totals[name] = totals.get(name, 0.0) + sales
+    return [(t, tokenize(t)) for t in sorted(totals, key=lambda t: -totals[t])]
+
+
+def brute_force(ranked, query, limit):
+    """Titles starting with the query first, then every other word-prefix match."""
+    words = tokenize(query)
+    if not words:
+        return []
+    phrase = " ".join(words)
+    starts, others = [], []
+    for title, tokens in ranked:
+        if all(any(t.startswith(w) for t in tokens) for w in words):
+            (starts if " ".join(tokens).startswith(phrase) else others).append(title)
+    return (starts + others)[:limit]
+
+
+@pytest.fixture(scope="module")
+def vgsales():
+    if not VGSALES.exists():
+        pytest.skip("data/vgsales.csv not found")
+    return pd.read_csv(VGSALES)
+
+
+@pytest.fixture(scope="module")
+def index(vgsales):
+    return TitleIndex(vgsales)
+
+
+def test_gather():
+    starts = np.array([5, 0, 9])
+    lengths = np.array([2, 0, 3])
+    assert _gather(starts, lengths).tolist() == [5, 6, 9, 10, 11]
+    assert _gather(np.array([], dtype=int), np.array([], dtype=int)).tolist() == []
+
+
+def test_search_matches_brute_force(vgsales, index):
+    ranked = ranked_titles(vgsales)
+    titles = vgsales["Name"].dropna().sample(100, random_state=0).tolist()
+    queries = {t[:n] for t in titles for n in (1, 2, 3, 6, 12)}
+    queries |= {" ".join(tokenize(t)[1:3]) for t in titles}
+    queries |= {"2", "O", "mario kart", "call of duty", "pokemon red", "zzzz", "   ", ""}
+    for query in sorted(queries):
+        expected = brute_force(ranked, query, 20)
+        for limit in (1, 10, 20):
+            assert index.search(query, limit) == expected[:limit], (query, limit)
+
+
+def test_starting_with_ranks_first(index):
+    assert index.search("2", limit=20)[0].startswith("2")
+    assert "Onimusha 2: Samurai's Destiny" in index.search("O", limit=20)
+
+
+def test_lookup(vgsales, index):
+    title = "Grand Theft Auto V"
+    expected = vgsales[vgsales["Name"] == title]
+    assert sorted(index.lookup(title).index) == sorted(expected.index)
+    assert index.lookup("No Such Game").empty
+
+
+def test_small_frame_with_ties_and_missing_names():
+    df = pd.DataFrame({
+        "Name": ["Zelda", "Alpha Zelda", None, "Zelda II", "zel", "Alpha Zelda"],
+        "Global_Sales": [1.0, 0.5, 9.0, 1.0, 0.1, 0.5],
+    })
+    index = TitleIndex(df)
+    ranked = ranked_titles(df)
+    assert len(index) == 4
+    for query in ("z", "zel", "zelda", "alpha z", "ii", "q"):
+        assert index.search(query, limit=3) == brute_force(ranked, query, 3), query
+    assert sorted(index.lookup("Alpha Zelda").index) == [1, 5]
@@ -2,12 +2,15 @@
 import os
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine
 from sklearn.model_selection import train_test_split, RandomizedSearchCV, KFold
 from sklearn.metrics import r2_score
 from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
 from xgboost import XGBRegressor
 import joblib
+import db
+import explanations
+import instrumentation
+from instrumentation import span, timed
 from preprocessor import FullPreprocessor
 from dotenv import load_dotenv
 
@@ -16,15 +19,9 @@ load_dotenv()
 # -------------------------------------------------------
 # Load data
 # -------------------------------------------------------
+@timed("train.load_data")
 def load_data():
-    print("Loading data from MySQL...")
-    
-    DB_USER = os.getenv("DB_USER", "root")
-    DB_PASSWORD = os.getenv("DB_PASSWORD")
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_NAME = os.getenv("DB_NAME", "game_sales")
-    
-    engine = create_engine(f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}")
+    print("Loading data from database...")
 
     query = """
     SELECT
@@ -45,13 +42,14 @@ def load_data():
     WHERE v.Global_Sales > 0
     """
 
-    df = pd.read_sql(query, engine)
+    df = db.read_sql(query)
     print(f"Loaded {len(df):,} rows\n")
     return df
 
 # -------------------------------------------------------
 # Simple Feature Engineering (Minor additions)
 # -------------------------------------------------------
+@timed("train.add_features")
 def add_features(df):
     print("Adding simple features...")
     
@@ -114,7 +112,8 @@ def train_and_evaluate(X_train, X_test, y_train, y_test):
         scoring="neg_mean_squared_error",
         n_jobs=-1, random_state=42, verbose=1
     )
-    xgb_search.fit(X_train, y_train)
+    with span("train.tune_xgb"):
+        xgb_search.fit(X_train, y_train)
     xgb_best = xgb_search.best_estimator_
 
     pred_xgb = xgb_best.predict(X_test)
@@ -134,7 +133,8 @@ def train_and_evaluate(X_train, X_test, y_train, y_test):
         random_state=42,
         n_jobs=-1
     )
-    rf.fit(X_train, y_train)
+    with span("train.fit_rf"):
+        rf.fit(X_train, y_train)
 
     pred_rf = rf.predict(X_test)
     rmse_rf = rmse(y_test, pred_rf)
@@ -152,7 +152,8 @@ def train_and_evaluate(X_train, X_test, y_train, y_test):
         random_state=42,
         n_jobs=-1
     )
-    et.fit(X_train, y_train)
+    with span("train.fit_et"):
+        et.fit(X_train, y_train)
 
     pred_et = et.predict(X_test)
     rmse_et = rmse(y_test, pred_et)
@@ -167,6 +168,7 @@ def train_and_evaluate(X_train, X_test, y_train, y_test):
     }
 
 # Save models
+@timed("train.save_models")
 def save_models(pre, results):
     print("Saving models...")
     os.makedirs("models", exist_ok=True)
@@ -196,7 +198,8 @@ def main():
     y = df["Global_Sales"]
 
     print("Fitting preprocessor...")
-    X_prep = pre.fit_transform(X, y)
+    with span("train.fit_preprocessor", rows=len(X)):
+        X_prep = pre.fit_transform(X, y)
     print(f"Preprocessor OK ({X_prep.shape[1]} features)\n")
 
     # Split data
@@ -212,6 +215,12 @@ def main():
     # Save models
     save_models(pre, results)
 
+    # Global SHAP importance is stored with the models so the dashboard never computes it
+    print("Computing global SHAP importance (XGBoost)...")
+    with span("train.shap_importance"):
+        explanations.save_global_importance(results["xgb"][0], pre, X_test)
+    print(f"Saved to {explanations.IMPORTANCE_PATH}\n")
+
     # Summary
     print("="*60)
     print("FINAL SUMMARY")
@@ -222,5 +231,7 @@ def main():
     best = max(results.keys(), key=lambda k: results[k][2])
     print(f"\nBest Model = {best.upper()} (R2={results[best][2]:.4f})")
 
+    instrumentation.flush()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file